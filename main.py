@@ -4,26 +4,76 @@ import time
 import sys
 import os
 import csv
-from datetime import datetime
+import atexit
+import select
+
+try:
+    import termios
+    import tty
+except ImportError:
+    # Windows: no termios, sessions just run without key controls
+    termios = None
 
 LOG_FILE = "meditation_log.csv"
+LOG_FIELDS = ["timestamp", "type", "duration_min", "notes"]
+
+BAR_LEN = 30
+_BARS = tuple("[" + "#" * i + "-" * (BAR_LEN - i) + "]" for i in range(BAR_LEN + 1))
+
+if os.name == "nt":
+    # raw fd writes are decoded with the console code page, not UTF-8; sys.stdout
+    # goes through WriteConsoleW, so keep the text path there
+    _STDOUT_FD = None
+else:
+    try:
+        _STDOUT_FD = sys.stdout.fileno()
+    except (AttributeError, ValueError, OSError):
+        # e.g. IDLE, where sys.stdout is not backed by a real file descriptor
+        _STDOUT_FD = None
+
+# when output goes to a file or pipe the progress bar is skipped entirely
+_IS_TTY = sys.stdout.isatty()
+
+try:
+    _STDIN_FD = sys.stdin.fileno()
+except (AttributeError, ValueError, OSError):
+    # IDLE again: its stdin claims isatty() but has no file descriptor
+    _STDIN_FD = None
+
+# space pauses/resumes and q stops a running session, where the terminal allows it
+_KEYS_ENABLED = termios is not None and _IS_TTY and _STDIN_FD is not None and sys.stdin.isatty()
 
 # -------------------- Utility Functions --------------------
 
+class SessionStopped(Exception):
+    # raised by progress_bar when the user presses q; carries the minutes actually sat
+    def __init__(self, elapsed_min):
+        super().__init__(elapsed_min)
+        self.elapsed_min = elapsed_min
+
+_CLEAR_SEQ = b"\x1b[2J\x1b[H"
+_CLR_LINE = b"\r\x1b[2K"
+
+# pick the platform-specific bell once instead of checking os.name on every call
+if os.name == "nt":
+    import winsound
+
+    # an empty system() call switches the Windows 10+ console into VT (ANSI) mode
+    os.system("")
+
+    def _ring():
+        # SND_ASYNC returns immediately instead of blocking like Beep() does
+        winsound.PlaySound("SystemAsterisk", winsound.SND_ALIAS | winsound.SND_ASYNC)
+else:
+    def _ring():
+        _write(b"\a")
+
 def clear():
-    if os.name == "nt":
-        _ = os.system("cls")
-    else:
-        _ = os.system("clear")
+    _write(_CLEAR_SEQ)
 
 def bell():
     try:
-        if os.name == "nt":
-            import winsound
-            winsound.Beep(440, 300)
-        else:
-            sys.stdout.write("\a")
-            sys.stdout.flush()
+        _ring()
     except Exception:
         print("\n***\n")
 
@@ -31,104 +81,207 @@ def log_session(kind, duration_min, notes=""):
     if notes == "":
         notes = input("Optional: Add a short note about this session (press Enter to skip): ")
     row = {
-        "timestamp": datetime.now().isoformat(sep=" ", timespec="seconds"),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
         "type": kind,
         "duration_min": duration_min,
         "notes": notes
     }
-    file_exists = os.path.exists(LOG_FILE)
-    with open(LOG_FILE, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["timestamp", "type", "duration_min", "notes"])
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(row)
+    _get_log_writer().writerow(row)
+    # one row per session, so push it to disk straight away rather than waiting for exit
+    _log_fh.flush()
+
+# The log stays open for the whole run and is closed on exit.
+_log_fh = None
+_log_writer = None
+
+def _get_log_writer():
+    global _log_fh, _log_writer
+    if _log_writer is None:
+        try:
+            needs_header = os.path.getsize(LOG_FILE) == 0
+        except OSError:
+            needs_header = True
+        _log_fh = open(LOG_FILE, "a", newline="", encoding="utf-8", buffering=8192)
+        _log_writer = csv.DictWriter(_log_fh, fieldnames=LOG_FIELDS)
+        if needs_header:
+            _log_writer.writeheader()
+        atexit.register(_close_log)
+    return _log_writer
+
+def _close_log():
+    global _log_fh, _log_writer
+    if _log_fh is not None:
+        _log_fh.close()
+        _log_fh = None
+        _log_writer = None
+
+def _write(buf):
+    if _STDOUT_FD is None:
+        sys.stdout.write(buf.decode("utf-8"))
+        sys.stdout.flush()
+    else:
+        # push out anything print() left in the text buffer so output stays ordered
+        sys.stdout.flush()
+        os.write(_STDOUT_FD, buf)
 
 def print_centered(s, width=60):
     print(s.center(width))
 
-def progress_bar(total_seconds, prefix=""):
-    start = time.time()
+def _wait_key(timeout):
+    # sleep for up to timeout seconds (None = forever), returning early with a key press
+    if not _KEYS_ENABLED:
+        time.sleep(timeout)
+        return None
+    ready, _, _ = select.select([_STDIN_FD], [], [], timeout)
+    if ready:
+        return os.read(_STDIN_FD, 1)
+    return None
+
+def progress_bar(total_seconds, prefix="", script=()):
+    if not _KEYS_ENABLED:
+        _progress_loop(total_seconds, prefix, script)
+        return
+    saved = termios.tcgetattr(_STDIN_FD)
+    tty.setcbreak(_STDIN_FD)
+    try:
+        _progress_loop(total_seconds, prefix, script)
+    finally:
+        termios.tcsetattr(_STDIN_FD, termios.TCSADRAIN, saved)
+
+def _progress_loop(total_seconds, prefix, script):
+    # script is an optional sequence of (seconds, line) pairs built by _script_line,
+    # printed above the bar as they come due; prefix may use {part} and {parts} to
+    # show how many of those lines have been reached
+    total_s = int(total_seconds)
+    start = time.monotonic()
+    last = None
+    i = 0
+    label = prefix.format(part=i, parts=len(script))
     while True:
-        elapsed = time.time() - start
+        elapsed = time.monotonic() - start
+        # lines due right at the end (e.g. a zero-length session) are still shown
+        if i < len(script) and elapsed >= script[i][0]:
+            if _IS_TTY:
+                _write(_CLR_LINE)
+            while i < len(script) and elapsed >= script[i][0]:
+                _write(script[i][1])
+                i += 1
+            label = prefix.format(part=i, parts=len(script))
+            last = None
         if elapsed >= total_seconds:
             break
-        percent = elapsed / total_seconds
-        bar_len = 30
-        filled = int(percent * bar_len)
-        bar = "[" + "#" * filled + "-" * (bar_len - filled) + "]"
-        mins_left = int((total_seconds - elapsed) // 60)
-        secs_left = int((total_seconds - elapsed) % 60)
-        sys.stdout.write(f"\r{prefix} {bar} {mins_left:02d}:{secs_left:02d} remaining")
-        sys.stdout.flush()
-        time.sleep(0.5)
-    sys.stdout.write("\r" + " " * 80 + "\r")
+        if not _IS_TTY:
+            # no bar to keep fresh: sleep straight through to the next script line or the end
+            wake = script[i][0] if i < len(script) else total_seconds
+            time.sleep(max(0.0, min(wake, total_seconds) - (time.monotonic() - start)))
+            continue
+        elapsed_s = int(elapsed)
+        filled = (elapsed_s * BAR_LEN) // total_s if total_s else BAR_LEN
+        mins_left, secs_left = divmod(total_s - elapsed_s, 60)
+        state = (filled, mins_left, secs_left)
+        if state != last:
+            bar = _BARS[filled]
+            _write(f"\r{label} {bar} {mins_left:02d}:{secs_left:02d} remaining".encode("utf-8"))
+            last = state
+        # wake up on the next whole second, but never past the end or the next script line
+        elapsed = time.monotonic() - start
+        wake = min(total_seconds, script[i][0]) if i < len(script) else total_seconds
+        key = _wait_key(max(0.0, min(1.0 - elapsed % 1.0, wake - elapsed)))
+        if key == b" ":
+            paused_at = time.monotonic()
+            _write(f"\r{label} {bar} {mins_left:02d}:{secs_left:02d} paused   ".encode("utf-8"))
+            key = _wait_key(None)
+            start += time.monotonic() - paused_at
+            last = None
+        if key in (b"q", b"Q"):
+            _write(_CLR_LINE)
+            raise SessionStopped(round((time.monotonic() - start) / 60, 1))
+    if _IS_TTY:
+        _write(_CLR_LINE)
 
 # -------------------- Guided Meditations --------------------
 
-GUIDED_5 = [
-    (0, "Sit comfortably, spine straight, hands relaxed."),
-    (8, "Close your eyes softly. Bring attention to the breath."),
-    (20, "Follow your inhale... and your exhale. No need to control."),
-    (60, "If the mind wanders, gently bring it back to the breath."),
-    (120, "Feel the body—weight on the seat, ground beneath you."),
-    (180, "Notice sounds outside without judging them."),
-    (240, "Feel gratitude for this time. When ready, deepen the breath."),
-]
-
-GUIDED_10 = [
-    (0, "Make yourself comfortable. Relax your shoulders."),
-    (10, "Close your eyes. Take three slow breaths, in and out."),
-    (30, "Allow your breath to find its own natural rhythm."),
-    (90, "Scan the body from head to toe—release any tension."),
-    (180, "Focus on the rise and fall of the chest or belly."),
-    (300, "If thoughts appear, label them 'thinking' and let them pass."),
-    (420, "Extend your out-breath by one second — just softly."),
-    (540, "Bring kindness to yourself. Hold this moment of calm."),
-    (570, "When ready, wiggle your fingers and toes and open eyes slowly."),
-]
-
-GUIDED_15 = [
-    (0, "Begin seated or lying down. Let the body soften."),
-    (12, "Take a deep inhalation and a slow exhalation."),
-    (40, "Scan your body and breathe into any tight spots."),
-    (120, "Now focus on breath sensations — cool at the nostrils, warm at the exhale."),
-    (300, "If a thought grabs you, observe it, then return to the breath."),
-    (480, "Stay with a gentle attention; do not push or force."),
-    (660, "Offer a short gratitude for something simple (a breath, a sound)."),
-    (840, "Slowly deepen your breath and return awareness to the room."),
-    (880, "When ready, open your eyes and take this calm into your next minutes."),
-]
-
-GUIDED_LOVING_KINDNESS = [
-    (0, "Sit comfortably, close your eyes, and take a deep breath."),
-    (15, "Bring to mind someone you care about and silently wish them happiness."),
-    (60, "Now extend this feeling to yourself: wish yourself peace and well-being."),
-    (120, "Think of a neutral person and wish them kindness and joy."),
-    (180, "Now extend kindness to someone you have difficulties with, wish them well."),
-    (300, "Feel your heart expand with compassion for all beings."),
-    (480, "Take a few deep breaths and silently repeat 'May all beings be happy, safe, and free.'"),
-    (540, "Gently bring attention back to your breath."),
-    (570, "Slowly open your eyes when ready, carrying this calm with you."),
-]
+def _script_line(t, text, width=60):
+    # center and encode a line once so the session loop only has to write bytes
+    return (t, ("\n" + text.center(width) + "\n").encode("utf-8"))
+
+def _prepare_script(script):
+    return tuple(_script_line(t, text) for t, text in script)
+
+GUIDED_5 = (
+    _script_line(0, "Sit comfortably, spine straight, hands relaxed."),
+    _script_line(8, "Close your eyes softly. Bring attention to the breath."),
+    _script_line(20, "Follow your inhale... and your exhale. No need to control."),
+    _script_line(60, "If the mind wanders, gently bring it back to the breath."),
+    _script_line(120, "Feel the body—weight on the seat, ground beneath you."),
+    _script_line(180, "Notice sounds outside without judging them."),
+    _script_line(240, "Feel gratitude for this time. When ready, deepen the breath."),
+)
+
+GUIDED_10 = (
+    _script_line(0, "Make yourself comfortable. Relax your shoulders."),
+    _script_line(10, "Close your eyes. Take three slow breaths, in and out."),
+    _script_line(30, "Allow your breath to find its own natural rhythm."),
+    _script_line(90, "Scan the body from head to toe—release any tension."),
+    _script_line(180, "Focus on the rise and fall of the chest or belly."),
+    _script_line(300, "If thoughts appear, label them 'thinking' and let them pass."),
+    _script_line(420, "Extend your out-breath by one second — just softly."),
+    _script_line(540, "Bring kindness to yourself. Hold this moment of calm."),
+    _script_line(570, "When ready, wiggle your fingers and toes and open eyes slowly."),
+)
+
+GUIDED_15 = (
+    _script_line(0, "Begin seated or lying down. Let the body soften."),
+    _script_line(12, "Take a deep inhalation and a slow exhalation."),
+    _script_line(40, "Scan your body and breathe into any tight spots."),
+    _script_line(120, "Now focus on breath sensations — cool at the nostrils, warm at the exhale."),
+    _script_line(300, "If a thought grabs you, observe it, then return to the breath."),
+    _script_line(480, "Stay with a gentle attention; do not push or force."),
+    _script_line(660, "Offer a short gratitude for something simple (a breath, a sound)."),
+    _script_line(840, "Slowly deepen your breath and return awareness to the room."),
+    _script_line(880, "When ready, open your eyes and take this calm into your next minutes."),
+)
+
+GUIDED_LOVING_KINDNESS = (
+    _script_line(0, "Sit comfortably, close your eyes, and take a deep breath."),
+    _script_line(15, "Bring to mind someone you care about and silently wish them happiness."),
+    _script_line(60, "Now extend this feeling to yourself: wish yourself peace and well-being."),
+    _script_line(120, "Think of a neutral person and wish them kindness and joy."),
+    _script_line(180, "Now extend kindness to someone you have difficulties with, wish them well."),
+    _script_line(300, "Feel your heart expand with compassion for all beings."),
+    _script_line(480, "Take a few deep breaths and silently repeat 'May all beings be happy, safe, and free.'"),
+    _script_line(540, "Gently bring attention back to your breath."),
+    _script_line(570, "Slowly open your eyes when ready, carrying this calm with you."),
+)
+
+BODY_PARTS = (
+    "top of the head — notice sensations there",
+    "forehead and eyes — soften the muscles",
+    "jaw and mouth — let the jaw relax",
+    "neck and shoulders — release weight into the chair",
+    "arms, hands, and fingers — soft and heavy",
+    "chest and belly — breathe into the chest",
+    "lower back and hips — let them sink",
+    "thighs and knees — feel support",
+    "calves and shins — let go",
+    "feet and toes — notice contact with the floor",
+)
 
 # -------------------- Session Functions --------------------
 
+def _stopped(kind, elapsed_min):
+    print_centered("Session stopped early — that's okay.")
+    log_session(kind, elapsed_min)
+    input("Press Enter to return to menu...")
+
 def guided_session(script, duration_min):
     clear()
-    total_seconds = duration_min * 60
-    start_time = time.time()
     bell()
-    i = 0
-    while True:
-        elapsed = time.time() - start_time
-        if elapsed >= total_seconds:
-            break
-        while i < len(script) and elapsed >= script[i][0]:
-            print()
-            print_centered(script[i][1])
-            i += 1
-        remaining = max(0, total_seconds - elapsed)
-        progress_bar(remaining, prefix="Guided:")
+    try:
+        progress_bar(duration_min * 60, prefix="Guided:", script=script)
+    except SessionStopped as stop:
+        _stopped(f"Guided {duration_min} min (stopped)", stop.elapsed_min)
+        return
     bell()
     print_centered("Session complete — gently come back when ready.")
     log_session(f"Guided {duration_min} min", duration_min)
@@ -138,12 +291,24 @@ def custom_timer(duration_min):
     clear()
     print_centered(f"Custom silent timer — {duration_min} minutes")
     bell()
-    progress_bar(duration_min * 60, prefix="Timer:")
+    try:
+        progress_bar(duration_min * 60, prefix="Timer:")
+    except SessionStopped as stop:
+        _stopped("Custom timer (stopped)", stop.elapsed_min)
+        return
     bell()
     print_centered("Time's up. Well done.")
     log_session("Custom timer", duration_min)
     input("Press Enter to return to menu...")
 
+def _phase_loop(label, seconds, deadline):
+    # sleep towards absolute deadlines so per-second drift doesn't add up across cycles
+    for t in range(seconds, 0, -1):
+        _write(f"\r{label:8}: {t:2d} ".encode("utf-8"))
+        deadline += 1
+        time.sleep(max(0.0, deadline - time.monotonic()))
+    return deadline
+
 def box_breathing(cycles=4, inhale=4, hold=4, exhale=4):
     clear()
     print_centered("Box Breathing Exercise")
@@ -151,24 +316,12 @@ def box_breathing(cycles=4, inhale=4, hold=4, exhale=4):
     print(f"Cycles: {cycles}, Pattern: Inhale {inhale}s — Hold {hold}s — Exhale {exhale}s — Hold {hold}s")
     bell()
     time.sleep(1.2)
+    phases = [("Inhale", inhale), ("Hold", hold), ("Exhale", exhale), ("Hold", hold)]
+    deadline = time.monotonic()
     for c in range(1, cycles + 1):
         print(f"\nCycle {c}/{cycles}")
-        for t in range(inhale, 0, -1):
-            sys.stdout.write(f"\rInhale  : {t:2d} ")
-            sys.stdout.flush()
-            time.sleep(1)
-        for t in range(hold, 0, -1):
-            sys.stdout.write(f"\rHold    : {t:2d} ")
-            sys.stdout.flush()
-            time.sleep(1)
-        for t in range(exhale, 0, -1):
-            sys.stdout.write(f"\rExhale  : {t:2d} ")
-            sys.stdout.flush()
-            time.sleep(1)
-        for t in range(hold, 0, -1):
-            sys.stdout.write(f"\rHold    : {t:2d} ")
-            sys.stdout.flush()
-            time.sleep(1)
+        for label, seconds in phases:
+            deadline = _phase_loop(label, seconds, deadline)
         print()
     bell()
     print("\nBox breathing complete. Notice how you feel.")
@@ -177,32 +330,44 @@ def box_breathing(cycles=4, inhale=4, hold=4, exhale=4):
 
 def body_scan(duration_min=10):
     clear()
-    parts = [
-        "top of the head — notice sensations there",
-        "forehead and eyes — soften the muscles",
-        "jaw and mouth — let the jaw relax",
-        "neck and shoulders — release weight into the chair",
-        "arms, hands, and fingers — soft and heavy",
-        "chest and belly — breathe into the chest",
-        "lower back and hips — let them sink",
-        "thighs and knees — feel support",
-        "calves and shins — let go",
-        "feet and toes — notice contact with the floor"
-    ]
     total_seconds = duration_min * 60
-    per_part = total_seconds / len(parts)
+    per_part = total_seconds / len(BODY_PARTS)
+    script = _prepare_script([(i * per_part, f"Focus: {part}") for i, part in enumerate(BODY_PARTS)])
     bell()
     print_centered(f"Body-scan — {duration_min} minutes")
     time.sleep(1.2)
-    for idx, part in enumerate(parts, start=1):
-        print()
-        print_centered(f"Focus: {part}")
-        progress_bar(per_part, prefix=f"Part {idx}/{len(parts)}:")
+    try:
+        progress_bar(total_seconds, prefix="Part {part}/{parts}:", script=script)
+    except SessionStopped as stop:
+        _stopped(f"Body-scan {duration_min} min (stopped)", stop.elapsed_min)
+        return
     bell()
     print_centered("Body scan complete. Slowly reconnect with the room.")
     log_session(f"Body-scan {duration_min} min", duration_min)
     input("Press Enter to return to menu...")
 
+def _read_log_tail(n, block=4096):
+    # Only parse the header and the last n rows, reading backwards from the end of the file.
+    with open(LOG_FILE, "rb") as f:
+        header = f.readline()
+        body_start = f.tell()
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        lines = []
+        while pos > body_start and len(lines) < n:
+            step = min(block, pos - body_start)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            lines = tail.splitlines()
+            if pos > body_start:
+                # the first line may be cut off mid-row (or be the end of a split CRLF)
+                lines = lines[1:]
+            lines = [line for line in lines if line.strip()]
+    rows = [line.decode("utf-8", "replace") for line in lines[-n:]]
+    return list(csv.DictReader([header.decode("utf-8", "replace")] + rows))
+
 def show_log():
     clear()
     if not os.path.exists(LOG_FILE):
@@ -211,13 +376,12 @@ def show_log():
         return
     print_centered("Meditation Log")
     print("-" * 60)
-    with open(LOG_FILE, newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-        if not rows:
-            print("No sessions logged yet.")
-        else:
-            for r in rows[-20:]:
-                print(f"{r['timestamp']:20} | {r['type'][:20]:20} | {r['duration_min']:>5} min | {r['notes']}")
+    rows = _read_log_tail(20)
+    if not rows:
+        print("No sessions logged yet.")
+    else:
+        for r in rows:
+            print(f"{r['timestamp']:20} | {r['type'][:20]:20} | {r['duration_min']:>5} min | {r['notes']}")
     print("-" * 60)
     input("Press Enter to return to menu...")
 